@@ -4,149 +4,239 @@ ReScript State.res File Reorganizer
 
 This script reorganizes the State.res file to fix dependency ordering issues.
 ReScript requires all functions to be defined before they are used.
+
+The module is fully type-annotated so it can be compiled with mypyc
+(`mypyc reorganize_state.py`) when run over many files; the resulting
+extension module is imported in place of this file, which remains the
+pure-Python fallback.
 """
 
 import re
 import os
-from typing import List, Dict, Set, Tuple
+import bisect
+import heapq
+import shutil
+import tempfile
+from typing import Iterator, List, Dict, Match, Set, Tuple
+
+# Pattern to match function definitions
+_FUNC_RE = re.compile(r'let\s+(\w+)\s*=\s*\([^)]*\)\s*:\s*[^=]+=>\s*\{', re.MULTILINE)
+# Pattern to match type definitions
+_TYPE_RE = re.compile(r'type\s+(\w+)\s*=', re.MULTILINE)
+# Braces, plus the comments and literals whose braces must be ignored.
+# Only complete tokens are skipped: an unclosed comment, template or string
+# (strings must close on their own line) falls back to plain brace counting.
+_BRACE_TOKEN_RE = re.compile(r'''
+      //[^\n]*                 # line comment
+    | /\*.*?\*/                # block comment
+    | "(?:\\.|[^"\\\n])*"      # string literal
+    | `(?:\\.|[^`\\])*`        # template literal (${...} braces balance anyway)
+    | '(?:\\.|[^'\\\n])'       # char literal
+    | [{}]
+''', re.DOTALL | re.VERBOSE)
+# Only whitespace and comments may sit between a function body and the next definition
+# (each comment can only match one way, so a failed match can't backtrack exponentially)
+_BETWEEN_DEFINITIONS_RE = re.compile(r'(?:\s|//[^\n]*(?![^\n])|/\*(?:(?!\*/).)*\*/)*', re.DOTALL)
+# Any brace, for the plain counting fallback
+_RAW_BRACE_RE = re.compile(r'[{}]')
+# Blank line separating definitions
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\n')
+# Identifier token; a name is referenced when it is a whole token
+_IDENT_RE = re.compile(r'\w+')
+# Start of the first top-level definition, which ends the file header
+_DEFINITION_START_RE = re.compile(r'^(let |type )', re.MULTILINE)
+
+def match_braces(content: str) -> Tuple[Dict[int, int], List[int]]:
+    """
+    Pair up braces in a single pass, skipping comments and string, template
+    and char literals.
+    Returns: (open offset -> close offset, sorted list of all open offsets)
+    """
+    brace_match: Dict[int, int] = {}
+    open_braces: List[int] = []
+    stack: List[int] = []
+    
+    # The regex jumps straight to the next brace, comment or string
+    for match in _BRACE_TOKEN_RE.finditer(content):
+        token = match.group()
+        if token == '{':
+            stack.append(match.start())
+            open_braces.append(match.start())
+        elif token == '}':
+            if stack:
+                brace_match[stack.pop()] = match.start()
+    
+    return brace_match, open_braces
+
+def count_braces_end(content: str, start_pos: int) -> int:
+    """
+    Find the end of the function starting at start_pos by counting every brace.
+    Returns the offset just past its closing brace, or -1 if it never closes.
+    """
+    brace_count = 0
+    in_function = False
+    
+    for match in _RAW_BRACE_RE.finditer(content, start_pos):
+        if match.group() == '{':
+            brace_count += 1
+            in_function = True
+        else:
+            brace_count -= 1
+            if in_function and brace_count == 0:
+                return match.end()
+    
+    return -1
 
 def extract_functions(content: str) -> List[Tuple[str, str, int, int]]:
     """
     Extract function definitions with their dependencies.
     Returns: List of (function_name, full_definition, start_pos, end_pos)
     """
-    functions = []
+    functions: List[Tuple[str, str, int, int]] = []
     
-    # Pattern to match function definitions
-    func_pattern = r'let\s+(\w+)\s*=\s*\([^)]*\)\s*:\s*[^=]+=>\s*\{'
-    type_pattern = r'type\s+(\w+)\s*='
+    brace_match, open_braces = match_braces(content)
+    paragraph_breaks = [m.start() for m in _PARAGRAPH_BREAK_RE.finditer(content)]
+    definition_starts = [m.start() for m in _DEFINITION_START_RE.finditer(content)]
     
-    # Find all function definitions
-    for match in re.finditer(func_pattern, content, re.MULTILINE):
-        func_name = match.group(1)
-        start_pos = match.start()
-        
-        # Find the end of this function by counting braces
-        brace_count = 0
-        in_function = False
-        end_pos = start_pos
-        
-        for i, char in enumerate(content[start_pos:], start_pos):
-            if char == '{':
-                brace_count += 1
-                in_function = True
-            elif char == '}':
-                brace_count -= 1
-                if in_function and brace_count == 0:
-                    end_pos = i + 1
-                    break
-        
-        # Extract the full function definition
-        func_def = content[start_pos:end_pos]
-        functions.append((func_name, func_def, start_pos, end_pos))
-    
-    # Also find type definitions
-    for match in re.finditer(type_pattern, content, re.MULTILINE):
-        type_name = match.group(1)
-        start_pos = match.start()
+    # Walk function and type definitions together, already in file order
+    func_matches: Iterator[Tuple[int, str, Match[str]]] = ((m.start(), 'func', m) for m in _FUNC_RE.finditer(content))
+    type_matches: Iterator[Tuple[int, str, Match[str]]] = ((m.start(), 'type', m) for m in _TYPE_RE.finditer(content))
+    
+    for start_pos, kind, match in heapq.merge(func_matches, type_matches, key=lambda t: t[0]):
+        name = match.group(1)
         
-        # Find end of type definition (usually ends with newline or next definition)
-        end_pos = content.find('\n\n', start_pos)
-        if end_pos == -1:
-            end_pos = len(content)
+        if kind == 'func':
+            # The function body runs from its first brace to the matching one
+            idx = bisect.bisect_left(open_braces, start_pos)
+            first_brace = content.find('{', start_pos)
+            end_pos = -1
+            if idx < len(open_braces) and open_braces[idx] == first_brace and first_brace in brace_match:
+                end_pos = brace_match[first_brace] + 1
+            
+            # Trust that end only if nothing but whitespace and comments follows it
+            # before the next top-level definition: a comment or literal the
+            # tokenizer misread can make a body run over, or stop short
+            next_def = bisect.bisect_right(definition_starts, start_pos)
+            next_start = definition_starts[next_def] if next_def < len(definition_starts) else len(content)
+            if end_pos != -1 and (end_pos > next_start or
+                                  not _BETWEEN_DEFINITIONS_RE.fullmatch(content, end_pos, next_start)):
+                end_pos = -1
+            
+            if end_pos == -1:
+                # The tokenizer misread something before or inside this function
+                end_pos = count_braces_end(content, start_pos)
+                if end_pos == -1:
+                    raise ValueError(f"Could not find the end of function {name}")
+        else:
+            # Find end of type definition (usually ends with newline or next definition)
+            idx = bisect.bisect_left(paragraph_breaks, start_pos)
+            end_pos = paragraph_breaks[idx] if idx < len(paragraph_breaks) else len(content)
         
-        type_def = content[start_pos:end_pos]
-        functions.append((type_name, type_def, start_pos, end_pos))
+        # Extract the full definition
+        definition = content[start_pos:end_pos]
+        functions.append((name, definition, start_pos, end_pos))
     
-    return sorted(functions, key=lambda x: x[2])  # Sort by start position
+    return functions
 
-def find_dependencies(func_def: str, all_functions: Set[str]) -> Set[str]:
-    """Find which functions this definition depends on."""
-    dependencies = set()
-    
-    # Look for function calls and type usage
-    for func_name in all_functions:
-        # Check if this function/type is used in the definition
-        if re.search(rf'\b{func_name}\b', func_def):
-            dependencies.add(func_name)
+def find_dependencies(func_name: str, func_def: str, all_functions: Set[str]) -> Set[str]:
+    """Find which other functions this definition depends on."""
+    # Look for function calls and type usage: tokenize the definition once
+    # and keep the identifiers that name a known function/type
+    dependencies = set(_IDENT_RE.findall(func_def)) & all_functions
     
+    # The definition always mentions its own name
+    dependencies.discard(func_name)
     return dependencies
 
 def topological_sort(functions: Dict[str, str], dependencies: Dict[str, Set[str]]) -> List[str]:
-    """Sort functions by dependency order."""
-    visited = set()
-    temp_visited = set()
-    result = []
-    
-    def visit(func_name: str):
-        if func_name in temp_visited:
-            # Circular dependency - just continue
-            return
-        if func_name in visited:
-            return
-            
-        temp_visited.add(func_name)
+    """
+    Sort functions by dependency order.
+    Uses an explicit stack rather than recursion so deep dependency chains
+    can't hit the recursion limit. Dependencies are visited in sorted order
+    so the result is deterministic.
+    """
+    visited: Set[str] = set()
+    temp_visited: Set[str] = set()
+    result: List[str] = []
+    
+    def children(func_name: str) -> Iterator[str]:
+        return iter(sorted(dep for dep in dependencies.get(func_name, set())
+                           if dep in functions and dep != func_name))
+    
+    for root in functions:
+        if root in visited:
+            continue
         
-        # Visit dependencies first
-        for dep in dependencies.get(func_name, set()):
-            if dep in functions and dep != func_name:
-                visit(dep)
+        temp_visited.add(root)
+        stack: List[Tuple[str, Iterator[str]]] = [(root, children(root))]
         
-        temp_visited.remove(func_name)
-        visited.add(func_name)
-        result.append(func_name)
-    
-    for func_name in functions:
-        if func_name not in visited:
-            visit(func_name)
+        while stack:
+            func_name, deps = stack[-1]
+            
+            # Visit dependencies first
+            for dep in deps:
+                # Skip anything already placed or on the current path
+                # (a circular dependency - just continue)
+                if dep not in visited and dep not in temp_visited:
+                    temp_visited.add(dep)
+                    stack.append((dep, children(dep)))
+                    break
+            else:
+                stack.pop()
+                temp_visited.remove(func_name)
+                visited.add(func_name)
+                result.append(func_name)
     
     return result
 
-def reorganize_state_file(file_path: str):
+def write_atomic(file_path: str, text: str) -> None:
+    """Write text to a temp file beside file_path, then swap it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or '.',
+                                    prefix=os.path.basename(file_path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        # Keep the original file's permissions rather than mkstemp's 0600
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def reorganize_state_file(file_path: str) -> None:
     """Main function to reorganize the State.res file."""
     
     print(f"Reading {file_path}...")
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Extract header comments and imports
-    lines = content.split('\n')
-    header_lines = []
-    imports_section = []
-    
-    for i, line in enumerate(lines):
-        if line.startswith('//') or line.strip() == '' or line.startswith('open '):
-            header_lines.append(line)
-        elif line.startswith('let ') or line.startswith('type '):
-            # Start of function/type definitions
-            break
-        else:
-            header_lines.append(line)
-    
-    header = '\n'.join(header_lines)
+    # Extract header comments and imports (everything before the first definition)
+    first_def = _DEFINITION_START_RE.search(content)
+    if first_def:
+        header = content[:max(first_def.start() - 1, 0)]  # Drop the newline ending the header
+    else:
+        header = content
     
     # Extract function and type definitions
     print("Extracting functions...")
     extracted_functions = extract_functions(content)
     
     # Remove duplicates by name (keep the first occurrence)
-    unique_functions = {}
-    seen_names = set()
+    unique_functions: Dict[str, str] = {}
     
-    for name, definition, start, end in extracted_functions:
-        if name not in seen_names:
-            unique_functions[name] = definition
-            seen_names.add(name)
-        else:
+    for name, definition, _, _ in extracted_functions:
+        if name in unique_functions:
             print(f"Removing duplicate: {name}")
+            continue
+        unique_functions[name] = definition
     
     # Find dependencies
     print("Analyzing dependencies...")
     all_func_names = set(unique_functions.keys())
-    dependencies = {}
+    dependencies: Dict[str, Set[str]] = {}
     
     for func_name, func_def in unique_functions.items():
-        deps = find_dependencies(func_def, all_func_names)
+        deps = find_dependencies(func_name, func_def, all_func_names)
         dependencies[func_name] = deps
         if deps:
             print(f"{func_name} depends on: {deps}")
@@ -156,8 +246,8 @@ def reorganize_state_file(file_path: str):
     sorted_names = topological_sort(unique_functions, dependencies)
     
     # Separate types and functions for better organization
-    types = []
-    functions = []
+    types: List[str] = []
+    functions: List[str] = []
     
     for name in sorted_names:
         definition = unique_functions[name]
@@ -168,29 +258,31 @@ def reorganize_state_file(file_path: str):
     
     # Reconstruct the file
     print("Reconstructing file...")
-    new_content = header + '\n\n'
+    parts = [header, '\n\n']
     
     if types:
-        new_content += '// =============================================================================\n'
-        new_content += '// TYPE DEFINITIONS\n' 
-        new_content += '// =============================================================================\n\n'
-        new_content += '\n\n'.join(types) + '\n\n'
+        parts.append('// =============================================================================\n')
+        parts.append('// TYPE DEFINITIONS\n')
+        parts.append('// =============================================================================\n\n')
+        parts.append('\n\n'.join(types))
+        parts.append('\n\n')
     
     if functions:
-        new_content += '// =============================================================================\n'
-        new_content += '// FUNCTION DEFINITIONS (ordered by dependencies)\n'
-        new_content += '// =============================================================================\n\n'
-        new_content += '\n\n'.join(functions) + '\n'
+        parts.append('// =============================================================================\n')
+        parts.append('// FUNCTION DEFINITIONS (ordered by dependencies)\n')
+        parts.append('// =============================================================================\n\n')
+        parts.append('\n\n'.join(functions))
+        parts.append('\n')
+    
+    new_content = ''.join(parts)
     
     # Write the reorganized file
     backup_path = file_path + '.backup'
     print(f"Creating backup at {backup_path}")
-    with open(backup_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    shutil.copyfile(file_path, backup_path)
     
     print(f"Writing reorganized file to {file_path}")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
+    write_atomic(file_path, new_content)
     
     print("✅ Reorganization complete!")
     print(f"   - Processed {len(unique_functions)} functions/types")
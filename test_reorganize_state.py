@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Regression tests for reorganize_state.py.
+
+Function bodies must survive literals and comments that contain braces,
+quotes or `//`: a misread there used to give empty definitions, and the
+rewritten file lost their code. Dependency sorting must cope with chains
+deeper than the recursion limit and with cycles.
+"""
+
+import os
+import tempfile
+import unittest
+
+from reorganize_state import extract_functions, reorganize_state_file, topological_sort
+
+def spans(content):
+    return [(name, start, end) for name, _, start, end in extract_functions(content)]
+
+class ExtractFunctionsTest(unittest.TestCase):
+    def test_quote_inside_template(self):
+        content = ('let f = (x) : string => {\n  %raw(`x.replace(/"/g, "")`)\n}\n\n'
+                   'let g = (y) : string => {\n  y\n}\n')
+        self.assertEqual(spans(content), [('f', 0, 57), ('g', 59, 90)])
+
+    def test_slashes_inside_template(self):
+        content = 'let f = (x) : string => { `http://a/` }\n\nlet g = (y) : int => { 1 }\n'
+        self.assertEqual(spans(content), [('f', 0, 39), ('g', 41, 67)])
+
+    def test_quote_char_literal(self):
+        content = ("let f = (x) : string => {\n  let q = '\"'\n  x\n}\n\n"
+                   "let g = (y) : int => {\n  2\n}\n")
+        self.assertEqual(spans(content), [('f', 0, 45), ('g', 47, 75)])
+
+    def test_unterminated_string_stops_at_end_of_line(self):
+        content = ('let f = (x) : string => {\n  let s = "unterminated\n  x\n}\n\n'
+                   'let g = (y) : int => {\n  3\n}\n')
+        self.assertEqual(spans(content), [('f', 0, 55), ('g', 57, 85)])
+
+    def test_braces_inside_literals_and_comments(self):
+        content = ("let f = (x: option<'a>) : option<'a> => {\n"
+                   "  let c = '{'\n  // }\n  /* } */\n  let s = \"}\"\n  x\n}\n")
+        self.assertEqual(spans(content), [('f', 0, len(content) - 1)])
+
+    def test_slashes_in_jsx_text(self):
+        content = ('let f = (x) : string => {\n'
+                   '  <p> docs: https://rescript-lang.org {\n React.string(x)\n } </p>\n  link\n}\n\n'
+                   'let g = (y) : int => {\n  y\n}\n')
+        self.assertEqual(spans(content), [('f', 0, 99), ('g', 101, 129)])
+
+    def test_nested_block_comment(self):
+        content = ('let f = (x) : int => {\n  /* a /* { */ } */\n  x\n}\n\n'
+                   'let g = (y) : int => {\n  y\n}\n')
+        self.assertEqual(spans(content), [('f', 0, 48), ('g', 50, 78)])
+
+    def test_unclosed_function_is_an_error(self):
+        with self.assertRaises(ValueError):
+            extract_functions('let f = (x) : int => {\n  x\n')
+
+class TopologicalSortTest(unittest.TestCase):
+    def test_chain_deeper_than_recursion_limit(self):
+        # f1099 -> f1098 -> ... -> f0, visited from the deepest end
+        names = [f'f{i}' for i in range(1100)]
+        functions = {name: '' for name in reversed(names)}
+        dependencies = {names[i]: {names[i - 1]} for i in range(1, len(names))}
+        self.assertEqual(topological_sort(functions, dependencies), names)
+
+    def test_cycle_is_broken_in_sorted_order(self):
+        functions = {'main': '', 'b': '', 'a': ''}
+        dependencies = {'main': {'b', 'a'}, 'a': {'b'}, 'b': {'a'}}
+        self.assertEqual(topological_sort(functions, dependencies), ['b', 'a', 'main'])
+
+class ReorganizeStateFileTest(unittest.TestCase):
+    def reorganize(self, content):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'State.res')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            reorganize_state_file(path)
+            with open(path, encoding='utf-8') as f:
+                return f.read()
+
+    def test_rewrite_keeps_function_bodies(self):
+        rewritten = self.reorganize('let g = (y) : string => {\n  f(y)\n}\n\n'
+                                    'let f = (x) : string => {\n  %raw(`x.replace(/"/g, "")`)\n}\n')
+        self.assertIn('%raw(`x.replace(/"/g, "")`)', rewritten)
+        self.assertLess(rewritten.index('let f ='), rewritten.index('let g ='))
+
+    def test_rewrite_keeps_jsx_after_url(self):
+        body = ('let f = (x) : string => {\n'
+                '  <p> docs: https://rescript-lang.org {\n React.string(x)\n } </p>\n  link\n}')
+        rewritten = self.reorganize(body + '\n')
+        self.assertIn(body, rewritten)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,18 +9,103 @@ have been properly addressed in the final implementation.
 import os
 import json
 import re
-from typing import List, Dict, Tuple
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, List, Dict, Optional, Set, Tuple
+
+# orjson is optional; its JSONDecodeError subclasses json.JSONDecodeError
+json_loads: Callable[[str], Any]
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# pyahocorasick is optional; without it keywords are found with plain `in` tests
+try:
+    import ahocorasick  # type: ignore[import-not-found]
+except ImportError:
+    ahocorasick = None
+
+# Key State.res functions, listed in the order they must be defined
+ORDERED_FUNCTIONS = [
+    'createTransactionInternal',
+    'selfAttest', 
+    'mineBlockFromMempool',
+    'updateDistributions',
+    'stateReducer'
+]
+
+_FUNC_POS_RE = re.compile(r'let (' + '|'.join(ORDERED_FUNCTIONS) + r')\s*=')
+
+# Keywords for the behavioral parity check, per file
+CORE_TYPE_KEYWORDS = ('type archetype', 'type transaction', 'type questionDistribution')
+ADR_028_KEYWORDS = ('updateDistributions', 'convergenceScore')
+
+# One lock per path, so different files are still read concurrently
+_read_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+_read_locks_guard = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _read_source(path: str) -> Optional[str]:
+    try:
+        return Path(path).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
+def read_source(path: str) -> Optional[str]:
+    """Return a file's contents (None if missing), reading each path only once."""
+    with _read_locks_guard:
+        lock = _read_locks[path]
+    # Checks run concurrently; the path's lock stops two of them reading the same file
+    with lock:
+        return _read_source(path)
+
+@lru_cache(maxsize=None)
+def _keyword_automaton(keywords: Tuple[str, ...]):
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+def find_keywords(content: str, keywords: Tuple[str, ...]) -> Set[str]:
+    """Return the keywords present in content, in a single scan when pyahocorasick is installed."""
+    if ahocorasick is None:
+        return {keyword for keyword in keywords if keyword in content}
+    return {keyword for _, keyword in _keyword_automaton(keywords).iter(content)}
+
+def find_missing_files(paths: List[str]) -> List[str]:
+    """Return the paths that don't exist, listing each directory only once."""
+    def split(path: str) -> Tuple[str, str]:
+        return os.path.dirname(path) or '.', os.path.basename(path)
+    
+    by_dir = defaultdict(set)
+    for path in paths:
+        directory, name = split(path)
+        by_dir[directory].add(name)
+    
+    present: Set[Tuple[str, str]] = set()
+    for directory, names in by_dir.items():
+        try:
+            with os.scandir(directory) as entries:
+                present.update((directory, e.name) for e in entries if e.name in names)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    
+    return [path for path in paths if split(path) not in present]
 
 def check_persistence_stubs() -> Tuple[bool, str]:
     """Check if stubbed data loading functions have been restored."""
     persistence_file = "src/Persistence.res"
     
-    if not os.path.exists(persistence_file):
+    content = read_source(persistence_file)
+    if content is None:
         return False, "Persistence.res file not found"
     
-    with open(persistence_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
     # Check for restored implementations
     has_real_curriculum_load = 'fetch("./reference/data/curriculum.json")' in content
     has_real_units_load = 'fetch("./reference/data/allUnitsData.js")' in content
@@ -40,12 +125,10 @@ def check_crypto_implementations() -> Tuple[bool, str]:
     """Check if mock crypto has been improved."""
     utils_file = "src/Utils.res"
     
-    if not os.path.exists(utils_file):
+    content = read_source(utils_file)
+    if content is None:
         return False, "Utils.res file not found"
     
-    with open(utils_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
     # Check for improved hash implementation
     has_improved_hash = 'for i in 0 to' in content and 'hash := hash.contents * 33' in content
     has_old_simple_hash = '"sha256:" ++ text' in content and 'simple mock' in content
@@ -61,14 +144,14 @@ def check_build_configuration() -> Tuple[bool, str]:
     """Check if build warnings have been addressed."""
     bsconfig_file = "bsconfig.json"
     
-    if not os.path.exists(bsconfig_file):
+    content = read_source(bsconfig_file)
+    if content is None:
         return False, "bsconfig.json file not found"
     
-    with open(bsconfig_file, 'r', encoding='utf-8') as f:
-        try:
-            config = json.load(f)
-        except json.JSONDecodeError as e:
-            return False, f"Invalid JSON in bsconfig.json: {e}"
+    try:
+        config = json_loads(content)
+    except json.JSONDecodeError as e:
+        return False, f"Invalid JSON in bsconfig.json: {e}"
     
     # Check for deprecated "es6" string format
     package_specs = config.get("package-specs", {})
@@ -83,28 +166,18 @@ def check_function_organization() -> Tuple[bool, str]:
     """Check if State.res has proper function ordering."""
     state_file = "src/State.res"
     
-    if not os.path.exists(state_file):
+    content = read_source(state_file)
+    if content is None:
         return False, "State.res file not found"
     
-    with open(state_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
     # Check for key functions in proper order
-    functions = [
-        'createTransactionInternal',
-        'selfAttest', 
-        'mineBlockFromMempool',
-        'updateDistributions',
-        'stateReducer'
-    ]
+    positions: Dict[str, int] = {}
+    for match in _FUNC_POS_RE.finditer(content):
+        # Keep the first definition of each function
+        positions.setdefault(match.group(1), match.start())
     
-    positions = {}
-    for func in functions:
-        pattern = rf'let {func}\s*='
-        match = re.search(pattern, content)
-        if match:
-            positions[func] = match.start()
-        else:
+    for func in ORDERED_FUNCTIONS:
+        if func not in positions:
             return False, f"❌ Function {func} not found"
     
     # Check if functions are in dependency order
@@ -118,6 +191,8 @@ def check_function_organization() -> Tuple[bool, str]:
 
 def check_compilation_status() -> Tuple[bool, str]:
     """Check if project compiles without errors."""
+    source_dir = "src"
+    
     # Look for generated JavaScript files
     js_files = [
         'src/Types.bs.js',
@@ -128,10 +203,23 @@ def check_compilation_status() -> Tuple[bool, str]:
         'src/Index.bs.js'
     ]
     
-    missing_files = []
+    # One walk of the source tree (bsconfig builds subdirs too) lists every
+    # file, including any extra modules; each needs an in-source .bs.js beside it.
+    # Paths are compared normalised so os.walk's separators match the list above.
+    present: Set[str] = set()
+    discovered: Dict[str, str] = {}
+    for dirpath, _, filenames in os.walk(source_dir):
+        for name in filenames:
+            present.add(os.path.normpath(os.path.join(dirpath, name)))
+            if name.endswith('.res'):
+                js_file = os.path.join(dirpath, name[:-len('.res')] + '.bs.js')
+                discovered[os.path.normpath(js_file)] = js_file
+    
     for js_file in js_files:
-        if not os.path.exists(js_file):
-            missing_files.append(js_file)
+        discovered.pop(os.path.normpath(js_file), None)
+    
+    expected = js_files + sorted(discovered.values())
+    missing_files = [js_file for js_file in expected if os.path.normpath(js_file) not in present]
     
     if not missing_files:
         return True, "✅ All modules compiled successfully"
@@ -148,10 +236,7 @@ def check_runtime_files() -> Tuple[bool, str]:
         'reference/data/allUnitsData.js'
     ]
     
-    missing_files = []
-    for file_path in required_files:
-        if not os.path.exists(file_path):
-            missing_files.append(file_path)
+    missing_files = find_missing_files(required_files)
     
     if not missing_files:
         return True, "✅ All runtime files present"
@@ -164,15 +249,11 @@ def check_parity_features() -> Tuple[bool, str]:
     checks = []
     
     # Check Types.res for comprehensive type definitions
-    if os.path.exists('src/Types.res'):
-        with open('src/Types.res', 'r') as f:
-            types_content = f.read()
-        
-        has_archetype = 'type archetype' in types_content
-        has_transaction = 'type transaction' in types_content  
-        has_question_dist = 'type questionDistribution' in types_content
+    types_content = read_source('src/Types.res')
+    if types_content is not None:
+        found = find_keywords(types_content, CORE_TYPE_KEYWORDS)
         
-        if has_archetype and has_transaction and has_question_dist:
+        if found.issuperset(CORE_TYPE_KEYWORDS):
             checks.append("✅ Core type definitions complete")
         else:
             checks.append("❌ Missing core type definitions")
@@ -180,14 +261,11 @@ def check_parity_features() -> Tuple[bool, str]:
         checks.append("❌ Types.res not found")
     
     # Check for ADR-028 compliance
-    if os.path.exists('src/State.res'):
-        with open('src/State.res', 'r') as f:
-            state_content = f.read()
+    state_content = read_source('src/State.res')
+    if state_content is not None:
+        found = find_keywords(state_content, ADR_028_KEYWORDS)
         
-        has_distribution_tracking = 'updateDistributions' in state_content
-        has_convergence = 'convergenceScore' in state_content
-        
-        if has_distribution_tracking and has_convergence:
+        if found.issuperset(ADR_028_KEYWORDS):
             checks.append("✅ ADR-028 distribution tracking implemented")
         else:
             checks.append("❌ ADR-028 features missing")
@@ -197,6 +275,13 @@ def check_parity_features() -> Tuple[bool, str]:
     else:
         return False, " | ".join(checks)
 
+def run_check(check_func: Callable[[], Tuple[bool, str]]) -> Tuple[bool, str]:
+    """Run a single check, reporting any exception as a failure."""
+    try:
+        return check_func()
+    except Exception as e:
+        return False, f"❌ Error: {e}"
+
 def main():
     """Run all validation checks."""
     print("🔍 ReScript Digital Twin - Fix Validation Report")
@@ -212,18 +297,12 @@ def main():
         ("Behavioral Parity Features", check_parity_features),
     ]
     
-    results = []
-    all_passed = True
+    # The checks are independent, so run them concurrently; results keep the listed order
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [(name, executor.submit(run_check, check_func)) for name, check_func in checks]
+        results = [(name, *future.result()) for name, future in futures]
     
-    for name, check_func in checks:
-        try:
-            passed, message = check_func()
-            results.append((name, passed, message))
-            if not passed:
-                all_passed = False
-        except Exception as e:
-            results.append((name, False, f"❌ Error: {e}"))
-            all_passed = False
+    all_passed = all(passed for _, passed, _ in results)
     
     # Print results
     print(f"\n📊 Validation Results ({len([r for r in results if r[1]])} / {len(results)} passed):")